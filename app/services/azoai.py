@@ -1,12 +1,13 @@
 import os
 import time
+from functools import lru_cache
 
 from openai import AzureOpenAI
 from opentelemetry.trace import StatusCode, Status
 from opentelemetry import trace
 
 from models.translate import TranslateRequest, TranslateResponse, EvaluationRequest, EvaluationResponse
-from .observability import get_logger, get_meter, get_tracer, setup_async_function_call_processor
+from .observability import LocalCounterGroup, get_logger, get_meter, get_tracer, setup_async_function_call_processor
 
 
 # Language code to language name mapping
@@ -17,6 +18,21 @@ language_map = {
     'de': 'German',
     'ja': 'Japanese'
 }
+_known_languages = frozenset(language_map.values())
+
+
+# bounded to the language_map pairs; callers may pass any language
+@lru_cache(maxsize=len(language_map) ** 2)
+def translation_system_prompt(source_language, target_language) -> str:
+    """Returns the translation system prompt for a language pair, formatted once per pair."""
+    return '''You are a translator. YOU ONLY TRANSLATE. You are asked to translate the text you receive from {source_language} to {target_language}.
+            The translation should avoid the following issues:
+            - Distortion: An element of meaning in the source text is altered in the target text.
+            - Unjustified omission: An element of meaning in the source text is not transferred into the target text.
+            - Unjustified addition: An element of meaning that does not exist in the source text is added to the target text.
+            - Inappropriate register: Incorrect variety of language or inappropriate vocabulary for the text type (e.g. inappropriate level of formality or informality).
+            - Unidiomatic expression: An expression sounding unnatural or awkward to a native speaker irrespective of the context in which the expression is used, but the intended meaning can be understood.
+            - Error of grammar, syntax, spelling or punctuation.'''.format(source_language=source_language, target_language=target_language)
 
 
 class AzureOpenAIManager:
@@ -25,16 +41,46 @@ class AzureOpenAIManager:
         self.logger = get_logger(__name__)
         self.latency_meter = get_meter().create_histogram(
             name="azoai_latency", description="Latency of Azure OpenAI requests", unit="ms")
-        self.input_tokens_meter = get_meter().create_counter(name="azoai_input_tokens",
-                                                             description="Number of input tokens for Azure OpenAI requests", unit="1")
-        self.output_tokens_meter = get_meter().create_counter(name="azoai_output_tokens",
-                                                              description="Number of output tokens for Azure OpenAI requests", unit="1")
-        self.total_tokens_meter = get_meter().create_counter(name="azoai_total_tokens",
-                                                             description="Total number of tokens for Azure OpenAI requests", unit="1")
+        # input, output and total tokens are always recorded together with the same attributes
+        self.tokens_meters = LocalCounterGroup(get_meter(), [
+            ("azoai_input_tokens", "Number of input tokens for Azure OpenAI requests", "1"),
+            ("azoai_output_tokens", "Number of output tokens for Azure OpenAI requests", "1"),
+            ("azoai_total_tokens", "Total number of tokens for Azure OpenAI requests", "1"),
+        ])
         self.evaluation_score_meter = get_meter().create_histogram(name="azoai_evaluation_score",
                                                                    description="Evaluation score (as percentage) for Azure OpenAI requests", unit="1")
+        self._attributes_cache = {}
         self.logger.info("AzureOpenAI initialized")
 
+    def _get_attributes(self, model, deployment_id, source_language, target_language):
+        """
+        Returns the shared metric/span attributes for a (model, deployment, language pair), building them only once.
+
+        Only language pairs from language_map are cached, since evaluation requests carry free-form languages;
+        any other pair gets a fresh dict. The returned tuple is (key, attributes); callers must not mutate the attributes.
+        """
+        key = (model, deployment_id, source_language, target_language)
+        attributes = self._attributes_cache.get(key)
+        if attributes is None:
+            attributes = {"model": model, "deployment": deployment_id,
+                          "source_language": source_language, "target_language": target_language, "temperature": 0.5}
+            if source_language in _known_languages and target_language in _known_languages:
+                self._attributes_cache[key] = attributes
+        return key, attributes
+
+    def _record_usage(self, key, attributes, total_time_ms, usage):
+        self.latency_meter.record(
+            amount=total_time_ms, attributes=attributes)
+        self.tokens_meters.add(key, attributes, usage.prompt_tokens,
+                               usage.completion_tokens, usage.total_tokens)
+
+    def _record_translation_span(self, span, attributes, source_text, translated_text, finish_reason):
+        span.set_attributes(attributes)
+        span.set_attribute("source_text", source_text)
+        span.set_attribute("translated_text", translated_text)
+        span.add_event(name="Translation", attributes={
+                       "end_reason": finish_reason})
+
     def translate_text(self, client: AzureOpenAI, deployment_id, source_language, target_language, source_text) -> str:
         """
         Translates the provided text from the source language to the target language using Azure OpenAI.
@@ -57,14 +103,7 @@ class AzureOpenAIManager:
                     messages=[
                         {
                             'role': 'system',
-                            'content': '''You are a translator. YOU ONLY TRANSLATE. You are asked to translate the text you receive from {source_language} to {target_language}.
-            The translation should avoid the following issues:
-            - Distortion: An element of meaning in the source text is altered in the target text.
-            - Unjustified omission: An element of meaning in the source text is not transferred into the target text.
-            - Unjustified addition: An element of meaning that does not exist in the source text is added to the target text.
-            - Inappropriate register: Incorrect variety of language or inappropriate vocabulary for the text type (e.g. inappropriate level of formality or informality).
-            - Unidiomatic expression: An expression sounding unnatural or awkward to a native speaker irrespective of the context in which the expression is used, but the intended meaning can be understood.
-            - Error of grammar, syntax, spelling or punctuation.'''.format(source_language=source_language, target_language=target_language)
+                            'content': translation_system_prompt(source_language, target_language)
                         },
                         {
                             'role': 'user',
@@ -76,25 +115,14 @@ class AzureOpenAIManager:
                 )
                 end_time = time.time()
                 total_time_ms = (end_time - start_time) * 1000
-                attributes = {"model": response.model, "deployment": deployment_id,
-                              "source_language": source_language, "target_language": target_language, "temperature": 0.5}
-
-                self.latency_meter.record(
-                    amount=total_time_ms, attributes=attributes)
-                self.input_tokens_meter.add(
-                    amount=response.usage.prompt_tokens, attributes=attributes)
-                self.output_tokens_meter.add(
-                    amount=response.usage.completion_tokens, attributes=attributes)
-                self.total_tokens_meter.add(
-                    amount=response.usage.total_tokens, attributes=attributes)
+                key, attributes = self._get_attributes(
+                    response.model, deployment_id, source_language, target_language)
+                self._record_usage(key, attributes, total_time_ms, response.usage)
 
                 target_response = response.choices[0].message.content
 
-                span.set_attributes(attributes)
-                span.set_attribute("source_text", source_text)
-                span.set_attribute("translated_text", target_response)
-                span.add_event(name="Translation", attributes={
-                               "end_reason": response.choices[0].finish_reason})
+                self._record_translation_span(
+                    span, attributes, source_text, target_response, response.choices[0].finish_reason)
 
                 span.set_status(status=Status(StatusCode.OK))
                 return target_response
@@ -160,20 +188,13 @@ class AzureOpenAIManager:
 
                 end_time = time.time()
                 total_time_ms = (end_time - start_time) * 1000
-                attributes = {"model": response.model, "deployment": deployment_id,
-                              "source_language": request.source_language, "target_language": request.target_language, "temperature": 0.5}
+                key, attributes = self._get_attributes(
+                    response.model, deployment_id, request.source_language, request.target_language)
 
                 evaluation_score = float(response.choices[0].message.content)
                 print(f"Evaluation score: {evaluation_score}")
 
-                self.latency_meter.record(
-                    amount=total_time_ms, attributes=attributes)
-                self.input_tokens_meter.add(
-                    amount=response.usage.prompt_tokens, attributes=attributes)
-                self.output_tokens_meter.add(
-                    amount=response.usage.completion_tokens, attributes=attributes)
-                self.total_tokens_meter.add(
-                    amount=response.usage.total_tokens, attributes=attributes)
+                self._record_usage(key, attributes, total_time_ms, response.usage)
                 self.evaluation_score_meter.record(
                     amount=evaluation_score * 100, attributes=attributes)
 
@@ -0,0 +1,153 @@
+"""
+Micro-benchmark of the observability work done on every translate_text request.
+
+Compares the current path (AzureOpenAIManager._get_attributes, _record_usage and _record_translation_span inside a
+translate_text span) against the previous one, which built a fresh attribute dict and recorded the latency histogram
+plus three synchronous token counters per request. Both run against in-memory meter and tracer providers bound
+directly to the observability module, so no exporter or network is involved whatever OTEL_* variables are set.
+
+Most of a request's cost is the SDK span lifecycle and attribute validation, which this module does not control,
+so the metrics recording of the current path is also timed on its own. Exits non-zero when the current path costs
+more than --budget-us per request, or its metrics recording more than --metrics-budget-us.
+
+Run from the app directory:
+    python -m services.bench_observability
+"""
+import argparse
+import sys
+import timeit
+from types import SimpleNamespace
+
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+
+from . import observability
+from .azoai import AzureOpenAIManager
+
+MODEL = "gpt-4o-mini"
+DEPLOYMENT = "gpt-4o-mini"
+SOURCE_LANGUAGE = "English"
+TARGET_LANGUAGE = "French"
+SOURCE_TEXT = "The quick brown fox jumps over the lazy dog. " * 20
+TRANSLATED_TEXT = "Le rapide renard brun saute par-dessus le chien paresseux. " * 20
+FINISH_REASON = "stop"
+USAGE = SimpleNamespace(prompt_tokens=120, completion_tokens=80, total_tokens=200)
+# roughly 2x the cost measured on a development container, to absorb slower machines without flaking
+DEFAULT_BUDGET_US = 100.0
+DEFAULT_METRICS_BUDGET_US = 15.0
+
+
+def bind_in_memory_observability() -> InMemoryMetricReader:
+    """Points the observability module at in-memory providers without calling initialize_observability()."""
+    reader = InMemoryMetricReader()
+    meter_provider = MeterProvider(metric_readers=[reader])
+    # no span processors: spans are sampled and recording, but never exported
+    tracer_provider = TracerProvider()
+    observability._main_meter = meter_provider.get_meter("bench")
+    observability._main_tracer = tracer_provider.get_tracer("bench")
+    observability._has_already_init = True
+    return reader
+
+
+def build_previous_path(meter, tracer):
+    latency_meter = meter.create_histogram(name="bench_previous_latency", unit="ms")
+    input_tokens_meter = meter.create_counter(name="bench_previous_input_tokens", unit="1")
+    output_tokens_meter = meter.create_counter(name="bench_previous_output_tokens", unit="1")
+    total_tokens_meter = meter.create_counter(name="bench_previous_total_tokens", unit="1")
+
+    def record():
+        with tracer.start_as_current_span("translate_text") as span:
+            attributes = {"model": MODEL, "deployment": DEPLOYMENT,
+                          "source_language": SOURCE_LANGUAGE, "target_language": TARGET_LANGUAGE, "temperature": 0.5}
+            latency_meter.record(amount=12.5, attributes=attributes)
+            input_tokens_meter.add(amount=USAGE.prompt_tokens, attributes=attributes)
+            output_tokens_meter.add(amount=USAGE.completion_tokens, attributes=attributes)
+            total_tokens_meter.add(amount=USAGE.total_tokens, attributes=attributes)
+
+            span.set_attributes(attributes)
+            span.set_attribute("source_text", SOURCE_TEXT)
+            span.set_attribute("translated_text", TRANSLATED_TEXT)
+            span.add_event(name="Translation", attributes={"end_reason": FINISH_REASON})
+
+    return record
+
+
+def build_current_path(manager: AzureOpenAIManager, tracer):
+    def record():
+        with tracer.start_as_current_span("translate_text") as span:
+            key, attributes = manager._get_attributes(MODEL, DEPLOYMENT, SOURCE_LANGUAGE, TARGET_LANGUAGE)
+            manager._record_usage(key, attributes, 12.5, USAGE)
+            manager._record_translation_span(span, attributes, SOURCE_TEXT, TRANSLATED_TEXT, FINISH_REASON)
+
+    return record
+
+
+def build_current_metrics(manager: AzureOpenAIManager):
+    def record():
+        key, attributes = manager._get_attributes(MODEL, DEPLOYMENT, SOURCE_LANGUAGE, TARGET_LANGUAGE)
+        manager._record_usage(key, attributes, 12.5, USAGE)
+
+    return record
+
+
+def measure(fn, number: int, repeat: int) -> float:
+    """Returns the best observed time per call, in microseconds."""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1_000_000
+
+
+def token_totals(reader: InMemoryMetricReader, name: str) -> int:
+    data = reader.get_metrics_data()
+    return sum(point.value
+               for resource_metrics in data.resource_metrics
+               for scope_metrics in resource_metrics.scope_metrics
+               for metric in scope_metrics.metrics if metric.name == name
+               for point in metric.data.data_points)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=100_000, help="calls per timing run")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs, the best one is reported")
+    parser.add_argument("--budget-us", type=float, default=DEFAULT_BUDGET_US,
+                        help="maximum allowed cost of the current path, in microseconds per request")
+    parser.add_argument("--metrics-budget-us", type=float, default=DEFAULT_METRICS_BUDGET_US,
+                        help="maximum allowed cost of the current metrics recording, in microseconds per request")
+    args = parser.parse_args()
+
+    reader = bind_in_memory_observability()
+    tracer = observability.get_tracer()
+
+    previous = build_previous_path(observability.get_meter(), tracer)
+    manager = AzureOpenAIManager()
+    current = build_current_path(manager, tracer)
+
+    previous_us = measure(previous, args.number, args.repeat)
+    current_us = measure(current, args.number, args.repeat)
+
+    # both paths ran the same number of times, so the exported token totals must agree
+    previous_total = token_totals(reader, "bench_previous_total_tokens")
+    current_total = token_totals(reader, "azoai_total_tokens")
+    assert previous_total == current_total, f"token totals differ: {previous_total} != {current_total}"
+
+    current_metrics_us = measure(build_current_metrics(manager), args.number, args.repeat)
+
+    print(f"previous path (4 instruments, fresh attributes, span): {previous_us:6.2f} us/request")
+    print(f"current path (cached attributes, local counters, span): {current_us:6.2f} us/request")
+    print(f"speedup: {previous_us / current_us:.1f}x")
+    print(f"current metrics recording only: {current_metrics_us:6.2f} us/request")
+
+    failed = False
+    for label, value, budget in (("current path", current_us, args.budget_us),
+                                 ("current metrics recording", current_metrics_us, args.metrics_budget_us)):
+        if value > budget:
+            print(f"FAIL: {label} exceeds the budget of {budget:.2f} us/request", file=sys.stderr)
+            failed = True
+    if failed:
+        return 1
+    print(f"OK: within the budgets of {args.budget_us:.2f} and {args.metrics_budget_us:.2f} us/request")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,9 @@
 import logging
 import os
 import re
+import threading
 from logging import Logger
-from typing import Dict, List, Literal
+from typing import Dict, Iterable, List, Literal, Tuple
 
 from fastapi import FastAPI
 
@@ -10,6 +11,7 @@ from .span_processors.evaluation_processor import AsyncFunctionCallSpanProcessor
 
 # OpenTelemetry
 from opentelemetry import metrics, trace
+from opentelemetry.metrics import CallbackOptions, Observation
 from opentelemetry.exporter.otlp.proto.grpc._log_exporter import OTLPLogExporter
 from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
@@ -210,6 +212,66 @@ def log_sensitive_data(
         span.set_attribute(SENSITIVE_DATA_INDICATOR_ATTRIBUTE_NAME, "true")
 
 
+class LocalCounterGroup:
+    """
+    A group of monotonic counters that share the same attribute sets and are aggregated in-process.
+
+    Each call to add() only bumps a few integers under a lock; the totals are reported to the
+    meter as observable counters when the metric reader collects, instead of going through the
+    SDK aggregation path once per counter per request.
+
+    Note that the counters are exported as asynchronous (observable) counters rather than synchronous ones.
+    At most max_attribute_sets attribute sets are tracked; amounts for any further set are folded into a
+    single overflow set marked with the otel.metric.overflow attribute.
+    """
+
+    OVERFLOW_KEY = ("otel.metric.overflow",)
+    OVERFLOW_ATTRIBUTES = {"otel.metric.overflow": True}
+
+    def __init__(self, meter: Meter, instruments: List[Tuple[str, str, str]], max_attribute_sets: int = 1000):
+        """
+        Creates one observable counter per (name, description, unit) entry in instruments.
+
+        :param meter: The meter used to create the observable counters.
+        :param instruments: The counters of the group, in the order their amounts are passed to add().
+        :param max_attribute_sets: Maximum number of distinct attribute sets kept before overflowing.
+        """
+        self._lock = threading.Lock()
+        self._max_attribute_sets = max_attribute_sets
+        # attribute key -> [attributes, total_0, total_1, ...]
+        self._totals: Dict[tuple, list] = {}
+        for index, (name, description, unit) in enumerate(instruments):
+            meter.create_observable_counter(
+                name=name, callbacks=[self._make_callback(index + 1)], description=description, unit=unit)
+
+    def add(self, key: tuple, attributes: Dict, *amounts: int):
+        """
+        Adds the amounts to the counters of the group for the given attribute set.
+
+        :param key: Hashable key identifying the attribute set.
+        :param attributes: The attributes reported with the totals for that key.
+        :param amounts: One amount per counter, in the order given to the constructor.
+        """
+        with self._lock:
+            totals = self._totals.get(key)
+            if totals is None:
+                if len(self._totals) >= self._max_attribute_sets:
+                    key, attributes = self.OVERFLOW_KEY, self.OVERFLOW_ATTRIBUTES
+                    totals = self._totals.get(key)
+                if totals is None:
+                    totals = self._totals[key] = [attributes] + [0] * len(amounts)
+            for index, amount in enumerate(amounts, start=1):
+                totals[index] += amount
+
+    def _make_callback(self, index: int):
+        def callback(options: CallbackOptions) -> Iterable[Observation]:
+            with self._lock:
+                snapshot = [(totals[0], totals[index]) for totals in self._totals.values()]
+            return [Observation(value, attributes) for attributes, value in snapshot]
+
+        return callback
+
+
 def instrument_application(app: FastAPI):
     _main_logger.info("Setting up OpenTelemetry instrumentation...")
     RequestsInstrumentor().instrument()